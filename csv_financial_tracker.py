@@ -1,14 +1,65 @@
 import os
+import re
+import time
+import hashlib
 import datetime
-import json
 import gspread
+from gspread.utils import a1_range_to_grid_range, absolute_range_name
 from google.oauth2.service_account import Credentials
 from datetime import datetime, timedelta
 import pandas as pd
-import matplotlib.pyplot as plt
-from io import BytesIO
-import base64
-import csv
+import numpy as np
+from functools import lru_cache
+
+# Stock symbols appear in parentheses in transaction descriptions, e.g. "Purchase of Apple (AAPL)"
+_STOCK_RE = re.compile(r'\(([A-Z.]+)\)')
+
+def call_with_backoff(func, *args, max_retries=5, base_delay=1.0, **kwargs):
+    """Call a Sheets API function, retrying with exponential backoff on rate-limit errors"""
+    for attempt in range(max_retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            status = e.response.status_code if getattr(e, 'response', None) is not None else None
+            if status not in (429, 503) or attempt == max_retries:
+                raise
+            time.sleep(min(base_delay * 2 ** attempt, 32))
+
+def as_text_cells(values):
+    """Prefix non-empty values with an apostrophe so USER_ENTERED stores them as literal text"""
+    # Keeps IDs like 000123 or long reference numbers from being parsed into numbers
+    return [f"'{value}" if value else value for value in values]
+
+# Columns read from the CSV and the defaults used when a column is missing
+CSV_DEFAULTS = {
+    'Date': '', 'Description': '', 'Amount': '0', 'Account': 'Unknown',
+    'Merchant': '', 'TransactionID': '', 'Pending': 'No'
+}
+
+# Column order of a row in the Transactions worksheet
+ROW_COLUMNS = ['Date', 'Description', 'Amount', 'Category', 'Account', 'TransactionID', 'Pending', 'Merchant']
+
+def read_csv_transactions(csv_file_path, chunksize=5000):
+    """Yield the CSV file as DataFrame chunks of string columns, filling in missing optional columns"""
+    try:
+        chunks = pd.read_csv(csv_file_path, chunksize=chunksize, dtype=str, keep_default_na=False,
+                             usecols=lambda column: column in CSV_DEFAULTS)
+    except pd.errors.EmptyDataError:
+        return  # An empty file has no transactions
+    for chunk in chunks:
+        for column, default in CSV_DEFAULTS.items():
+            if column not in chunk.columns:
+                chunk[column] = default
+        yield chunk
+
+@lru_cache(maxsize=None)
+def get_gspread_client(creds_path='google_credentials.json'):
+    """Authorize a gspread client once per credentials file and share it between callers"""
+    # The client's authorized session refreshes its token and keeps connections open across calls
+    scope = ['https://spreadsheets.google.com/feeds',
+             'https://www.googleapis.com/auth/drive']
+    creds = Credentials.from_service_account_file(creds_path, scopes=scope)
+    return gspread.authorize(creds)
 
 class FinancialTracker:
     def __init__(self, google_creds_path='google_credentials.json'):
@@ -25,12 +76,15 @@ class FinancialTracker:
             'Other': []
         }
         
+        # Cached category rules loaded from the Categories worksheet
+        self._category_rules = None
+        
+        # Fingerprint of the transaction IDs the dashboard was last built from
+        self._last_dashboard_hash = None
+        
     def initialize_google_sheets(self, creds_path):
         """Initialize Google Sheets API connection"""
-        scope = ['https://spreadsheets.google.com/feeds',
-                 'https://www.googleapis.com/auth/drive']
-        creds = Credentials.from_service_account_file(creds_path, scopes=scope)
-        self.gc = gspread.authorize(creds)
+        self.gc = get_gspread_client(creds_path)
         
     def create_financial_spreadsheet(self, sheet_name='My Financial Tracker', sheet_id=None):
         """Create a new Google Sheet for financial tracking or open existing one"""
@@ -100,6 +154,12 @@ class FinancialTracker:
             )
             print("Created Dashboard worksheet")
     
+    def get_transaction_ids(self):
+        """Fetch only the Transaction ID column below the header in a single API call"""
+        id_range = absolute_range_name(self.transactions_worksheet.title, 'F2:F')
+        response = self.sheet.values_get(id_range, params={'majorDimension': 'COLUMNS'})
+        return response.get('values', [[]])[0]
+    
     def import_csv_transactions(self, csv_file_path, date_format="%Y-%m-%d"):
         """
         Import transactions from a CSV file
@@ -111,68 +171,24 @@ class FinancialTracker:
         try:
             # Get existing transaction IDs to avoid duplicates
             try:
-                existing_transaction_ids = self.transactions_worksheet.col_values(6)[1:]  # Skip header
+                existing_transaction_ids = set(self.get_transaction_ids())
             except:
-                existing_transaction_ids = []
-            
-            # Read the CSV file
-            transactions = []
-            with open(csv_file_path, 'r') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    transactions.append(row)
+                existing_transaction_ids = set()
             
-            # Process and add each transaction
+            # Stream the CSV in chunks so memory stays bounded for large exports
             new_rows = 0
-            for transaction in transactions:
-                # Skip if transaction ID already exists
-                transaction_id = transaction.get('TransactionID', '')
-                if transaction_id in existing_transaction_ids:
+            timestamp = int(time.time())
+            for batch_index, chunk in enumerate(read_csv_transactions(csv_file_path)):
+                # Skip transactions whose ID already exists
+                chunk = chunk[~chunk['TransactionID'].isin(existing_transaction_ids)]
+                if chunk.empty:
                     continue
                 
-                # Parse date
-                try:
-                    # Try to parse the date with the provided format
-                    date_str = transaction.get('Date', '')
-                    date_obj = datetime.strptime(date_str, date_format)
-                    formatted_date = date_obj.strftime("%Y-%m-%d")
-                except ValueError:
-                    # If parsing fails, use the original string
-                    formatted_date = date_str
-                
-                # Get description and amount
-                description = transaction.get('Description', '')
-                try:
-                    amount = float(transaction.get('Amount', 0))
-                except ValueError:
-                    # Handle amounts with currency symbols or commas
-                    amount_str = transaction.get('Amount', '0').replace('$', '').replace(',', '')
-                    amount = float(amount_str)
-                
-                # Get account and merchant
-                account = transaction.get('Account', 'Unknown')
-                merchant = transaction.get('Merchant', '')
-                
-                # Determine if transaction is pending
-                pending = transaction.get('Pending', 'No')
+                rows = self.format_transaction_rows(chunk, date_format, batch_index, timestamp)
                 
-                # Categorize the transaction
-                category = self.categorize_transaction(description, merchant)
-                
-                # Format transaction row for Google Sheets
-                row = [
-                    formatted_date,
-                    description,
-                    amount,
-                    category,
-                    account,
-                    transaction_id if transaction_id else f"csv_{new_rows}_{int(datetime.now().timestamp())}",
-                    pending,
-                    merchant
-                ]
-                
-                self.transactions_worksheet.append_row(row)
-                new_rows += 1
+                # Add the whole chunk in one API call instead of one call per row
+                self.transactions_worksheet.append_rows(rows, value_input_option='USER_ENTERED')
+                new_rows += len(rows)
             
             print(f"Added {new_rows} new transactions to the sheet")
             
@@ -186,31 +202,77 @@ class FinancialTracker:
             print(f"Error importing CSV: {str(e)}")
             return 0
     
-    def categorize_transaction(self, description, merchant_name):
-        """Categorize a transaction based on its description and merchant"""
-        description = description.lower() if description else ""
-        merchant_name = merchant_name.lower() if merchant_name else ""
+    def format_transaction_rows(self, chunk, date_format='%Y-%m-%d', batch_index=0, timestamp=None):
+        """Convert a DataFrame chunk of CSV transactions into Transactions worksheet rows"""
+        chunk = chunk.copy()
+        timestamp = int(time.time()) if timestamp is None else timestamp
+        
+        # Parse dates with the provided format, keeping the original string if parsing fails
+        parsed_dates = pd.to_datetime(chunk['Date'], format=date_format, errors='coerce')
+        chunk['Date'] = parsed_dates.dt.strftime("%Y-%m-%d").where(parsed_dates.notna(), chunk['Date'])
+        
+        # Handle amounts with currency symbols or commas
+        chunk['Amount'] = pd.to_numeric(
+            chunk['Amount'].str.replace(r'[$,]', '', regex=True), errors='coerce'
+        ).fillna(0.0)
+        
+        # Categorize the transactions
+        chunk['Category'] = self.categorize_transactions(chunk['Description'], chunk['Merchant'])
+        
+        # Generate IDs for transactions that don't have one; batch and row indexes keep them unique
+        missing_ids = (chunk['TransactionID'] == '').to_numpy()
+        chunk.loc[missing_ids, 'TransactionID'] = [
+            f"csv_{batch_index}_{row_idx}_{timestamp}" for row_idx in np.flatnonzero(missing_ids)
+        ]
+        
+        # Dates and amounts are parsed by Sheets (USER_ENTERED), while free-text and ID cells
+        # are kept as literal text so they read back exactly as they appear in the CSV
+        for column in ['Description', 'Account', 'TransactionID', 'Merchant']:
+            chunk[column] = as_text_cells(chunk[column])
         
-        # Get categories and keywords from Google Sheet
+        return chunk[ROW_COLUMNS].values.tolist()
+    
+    def _load_category_rules(self):
+        """Load category keyword rules from the Categories worksheet once and compile them"""
+        if self._category_rules is not None:
+            return self._category_rules
+        
+        keyword_rules = []
         try:
             category_data = self.categories_worksheet.get_all_values()[1:]  # Skip header
             for row in category_data:
                 if len(row) < 2:
                     continue
-                    
-                category = row[0]
-                keywords = [k.strip().lower() for k in row[1].split(',')]
                 
-                # Check if any keyword is in the description or merchant name
-                for keyword in keywords:
-                    if keyword and (keyword in description or keyword in merchant_name):
-                        return category
+                keywords = [k.strip().lower() for k in row[1].split(',')]
+                keyword_rules.append((row[0], [k for k in keywords if k]))
         except:
             # If there's an error accessing the worksheet, use the default categories
-            for category, keywords in self.categories.items():
-                for keyword in keywords:
-                    if keyword.lower() in description or keyword.lower() in merchant_name:
-                        return category
+            keyword_rules = [(category, [k.lower() for k in keywords])
+                             for category, keywords in self.categories.items()]
+        
+        # Compile each category's keywords into a single alternation regex,
+        # skipping categories without keywords so they never match everything
+        self._category_rules = [
+            (category, re.compile('|'.join(map(re.escape, keywords)), re.I))
+            for category, keywords in keyword_rules
+            if keywords
+        ]
+        return self._category_rules
+    
+    def refresh_categories(self):
+        """Discard cached category rules so they are re-read from the sheet on next use"""
+        self._category_rules = None
+    
+    def categorize_transaction(self, description, merchant_name):
+        """Categorize a transaction based on its description and merchant"""
+        description = description.lower() if description else ""
+        merchant_name = merchant_name.lower() if merchant_name else ""
+        
+        # Check if any keyword is in the description or merchant name
+        for category, pattern in self._load_category_rules():
+            if pattern.search(description) or pattern.search(merchant_name):
+                return category
                     
         # Handle income (positive amounts)
         if "income" in description.lower() or "deposit" in description.lower() or "payroll" in description.lower():
@@ -219,111 +281,135 @@ class FinancialTracker:
         # Default category
         return "Other"
     
-    def update_dashboard(self, batch_updates=True, delay_seconds=0.5):
+    def categorize_transactions(self, descriptions, merchant_names):
+        """Categorize a Series of transactions at once, matching categorize_transaction row by row"""
+        pairs = pd.DataFrame({
+            'Description': descriptions.fillna('').to_numpy(),
+            'Merchant': merchant_names.fillna('').to_numpy()
+        })
+        
+        # Recurring transactions repeat the same description and merchant, so match each pair only once
+        unique_pairs = pairs.drop_duplicates(ignore_index=True)
+        unique_pairs['Category'] = self._match_categories(unique_pairs['Description'], unique_pairs['Merchant'])
+        
+        categories = pairs.merge(unique_pairs, on=['Description', 'Merchant'], how='left')['Category']
+        categories.index = descriptions.index
+        return categories
+    
+    def _match_categories(self, descriptions, merchant_names):
+        """Apply the category rules to Series of descriptions and merchant names"""
+        categories = pd.Series('Other', index=descriptions.index, dtype=object)
+        unmatched = pd.Series(True, index=descriptions.index)
+        
+        # The first category whose keywords appear in the description or merchant name wins
+        for category, pattern in self._load_category_rules():
+            matched = unmatched & (descriptions.str.contains(pattern) | merchant_names.str.contains(pattern))
+            categories[matched] = category
+            unmatched &= ~matched
+        
+        # Handle income (positive amounts)
+        is_income = unmatched & descriptions.str.contains('income|deposit|payroll', case=False)
+        categories[is_income] = 'Income'
+        
+        return categories
+    
+    def update_dashboard(self, batch_updates=True, delay_seconds=0.5, force=False):
         """
         Update the dashboard with investment charts and summaries
         
         Parameters:
         - batch_updates: Whether to use batched updates to reduce API calls
-        - delay_seconds: Delay between batch updates to avoid rate limits
+        - delay_seconds: Unused; batched updates are now sent as a single request
+        - force: Rebuild the dashboard even if the transactions are unchanged
         """
         # Get all transactions
         transactions_data = self.transactions_worksheet.get_all_values()[1:]  # Skip header
         
+        # Skip the rebuild when the set of transactions hasn't changed since the last update,
+        # fingerprinting the Transaction ID column of the rows already fetched
+        transactions_hash = hashlib.blake2b(
+            '\n'.join(sorted(row[5] for row in transactions_data if len(row) > 5)).encode(), digest_size=16
+        ).hexdigest()
+        
+        if not force and transactions_hash == self._last_dashboard_hash:
+            print("Transactions unchanged since last dashboard update, skipping")
+            return
+        
+        # Pick up any edits made to the Categories worksheet since the last run
+        self.refresh_categories()
+        
         if not transactions_data:
             print("No transactions to analyze")
             return
             
-        import time
-            
         # Convert to pandas DataFrame for analysis
         df = pd.DataFrame(transactions_data, columns=[
             "Date", "Description", "Amount", "Category", 
             "Account", "Transaction ID", "Pending", "Merchant Name"
         ])
         
-        # Convert amount to float
-        df['Amount'] = df['Amount'].astype(float)
+        # Convert amount to float, tolerating currency symbols and thousands separators
+        df['Amount'] = pd.to_numeric(
+            df['Amount'].astype(str).str.replace(r'[$,]', '', regex=True), errors='coerce'
+        ).fillna(0.0)
         
         # Convert date to datetime
         df['Date'] = pd.to_datetime(df['Date'])
         df['Month'] = df['Date'].dt.strftime('%Y-%m')
         
-        # Extract stock symbols from descriptions using regex
-        import re
-        def extract_stock_symbol(description):
-            match = re.search(r'\(([A-Z\.]+)\)', description)
-            if match:
-                return match.group(1)
-            return None
-            
-        df['Stock'] = df['Description'].apply(extract_stock_symbol)
+        # Store the small closed sets of categories and accounts as integer-coded categoricals.
+        # Categories added by hand in the Categories worksheet are kept alongside the defaults.
+        category_names = sorted(set(self.categories) | {'Income'} | set(df['Category'].unique()))
+        df['Category'] = df['Category'].astype(pd.CategoricalDtype(categories=category_names))
+        df['Account'] = df['Account'].astype('category')
         
-        # Prepare all updates in batches to minimize API calls
-        all_updates = []
-        all_formats = []
-        
-        # Clear existing dashboard - this is one API call
-        self.dashboard_worksheet.clear()
-        
-        # Add title
-        all_updates.append(('A1', 'Investment Dashboard'))
-        all_formats.append(('A1', {'textFormat': {'bold': True, 'fontSize': 14}}))
+        # Extract stock symbols from descriptions using a single vectorized regex pass
+        df['Stock'] = df['Description'].str.extract(_STOCK_RE, expand=False)
         
         # Investment Portfolio Summary
         # Total Buy, Sell, Dividend, Fee, and Capital transactions
-        total_buy = df[df['Category'] == 'Buy']['Amount'].sum()
-        total_sell = df[df['Category'] == 'Sell']['Amount'].sum() 
-        total_dividend = df[df['Category'] == 'Dividend']['Amount'].sum()
-        total_fee = df[df['Category'] == 'Fee']['Amount'].sum()
-        total_capital = df[df['Category'] == 'Capital']['Amount'].sum()
+        cat_totals = df.groupby('Category', sort=False, observed=True)['Amount'].sum()
+        total_buy = cat_totals.get('Buy', 0.0)
+        total_sell = cat_totals.get('Sell', 0.0)
+        total_dividend = cat_totals.get('Dividend', 0.0)
+        total_fee = cat_totals.get('Fee', 0.0)
+        total_capital = cat_totals.get('Capital', 0.0)
         
         # Calculate portfolio value
         portfolio_value = total_capital + total_buy + total_sell + total_dividend + total_fee
         
-        # Update summary data
-        all_updates.append(('A3', 'Portfolio Summary'))
-        all_formats.append(('A3', {'textFormat': {'bold': True}}))
-        
-        # Add summary rows
-        summary_updates = [
-            ('A4', 'Total Capital Deployed:'),
-            ('B4', f"${total_capital:,.2f}"),
-            ('A5', 'Total Stock Purchases:'),
-            ('B5', f"${abs(total_buy):,.2f}"),
-            ('A6', 'Total Stock Sales:'),
-            ('B6', f"${total_sell:,.2f}"),
-            ('A7', 'Total Dividend Income:'),
-            ('B7', f"${total_dividend:,.2f}"),
-            ('A8', 'Total Fees:'),
-            ('B8', f"${abs(total_fee):,.2f}"),
-            ('A9', 'Current Portfolio Value:'),
-            ('B9', f"${portfolio_value:,.2f}")
+        # Amounts are written as raw numbers and displayed via a currency number format
+        summary_rows = [
+            ['Total Capital Deployed:', total_capital],
+            ['Total Stock Purchases:', abs(total_buy)],
+            ['Total Stock Sales:', total_sell],
+            ['Total Dividend Income:', total_dividend],
+            ['Total Fees:', abs(total_fee)],
+            ['Current Portfolio Value:', portfolio_value]
         ]
         
-        all_updates.extend(summary_updates)
-        
         # Fund Allocation
-        fund_allocation = df.groupby('Account')['Amount'].sum().sort_values()
-        
-        all_updates.append(('A11', 'Fund Allocation'))
-        all_formats.append(('A11', {'textFormat': {'bold': True}}))
-        
-        for i, (fund, amount) in enumerate(fund_allocation.items(), start=12):
-            all_updates.append((f'A{i}', fund))
-            all_updates.append((f'B{i}', f"${amount:,.2f}"))
+        fund_allocation = df.groupby('Account', observed=True)['Amount'].sum().sort_values()
+        # Label cells are written as literal text so USER_ENTERED only parses the amounts
+        fund_allocation_rows = [[fund, amount] for fund, amount in zip(as_text_cells(fund_allocation.index), fund_allocation)]
+        
+        # Per-stock totals by category in one pass; holdings and dividends are column selections
+        stock_mask = df['Stock'].notna()
+        if stock_mask.any():
+            stock_pivot = df[stock_mask].pivot_table(
+                index='Stock',
+                columns='Category',
+                values='Amount',
+                aggfunc='sum',
+                fill_value=0,
+                observed=True
+            )
+        else:
+            stock_pivot = pd.DataFrame(dtype=float)
         
         # Stock Holdings (Buy transactions minus Sell transactions)
-        stock_transactions = df[df['Stock'].notna()].copy()
-        stock_holdings = stock_transactions.groupby('Stock')['Amount'].sum().sort_values()
-        
-        row_offset = len(fund_allocation) + 14
-        all_updates.append((f'A{row_offset}', 'Stock Holdings'))
-        all_formats.append((f'A{row_offset}', {'textFormat': {'bold': True}}))
-        
-        for i, (stock, amount) in enumerate(stock_holdings.items(), start=row_offset+1):
-            all_updates.append((f'A{i}', stock))
-            all_updates.append((f'B{i}', f"${amount:,.2f}"))
+        stock_holdings = stock_pivot.sum(axis=1).sort_values()
+        stock_holding_rows = [[stock, amount] for stock, amount in zip(as_text_cells(stock_holdings.index), stock_holdings)]
         
         # Monthly Activity
         monthly_by_category = df.pivot_table(
@@ -331,119 +417,115 @@ class FinancialTracker:
             columns='Category', 
             values='Amount', 
             aggfunc='sum', 
-            fill_value=0
+            fill_value=0,
+            observed=True
         )
+        monthly_headers = ['Month'] + as_text_cells(monthly_by_category.columns)
+        # Months like 2024-01 would otherwise be parsed into dates
+        monthly_rows = [
+            [month] + list(row)
+            for month, row in zip(as_text_cells(monthly_by_category.index), monthly_by_category.values.tolist())
+        ]
         
-        # Add chart data section
-        all_updates.append(('D3', 'Chart Data'))
-        all_formats.append(('D3', {'textFormat': {'bold': True}}))
-        
-        # Monthly activity data for charts
-        all_updates.append(('D4', 'Monthly Activity by Category'))
-        
-        # Create headers with all category columns
-        headers = ['Month'] + list(monthly_by_category.columns)
-        all_updates.append(('D5', [headers]))
+        # Chart data: current holdings (negative values), fund performance and dividends by stock
+        stock_rows = [[stock, abs(amount)] for stock, amount in stock_holding_rows if amount < 0]
+        fund_rows = fund_allocation_rows
         
-        # Add monthly data rows
-        monthly_rows = []
-        for month, row in monthly_by_category.iterrows():
-            monthly_rows.append([month] + list(row.values))
-            
-        if monthly_rows:
-            all_updates.append(('D6', monthly_rows))
+        has_dividends = 'Dividend' in df['Category'].values
+        if has_dividends and 'Dividend' in stock_pivot.columns:
+            stock_dividends = stock_pivot['Dividend']
+            dividend_by_stock = stock_dividends[stock_dividends != 0].sort_values(ascending=False)
+            dividend_by_stock = dividend_by_stock[dividend_by_stock.index.notna()]
+            div_rows = [[stock, amount] for stock, amount in zip(as_text_cells(dividend_by_stock.index), dividend_by_stock)]
+        else:
+            div_rows = []
         
-        # Stock allocation data for pie chart
+        # Starting rows of the variable-length sections
+        row_offset = len(fund_allocation) + 14
         stock_offset = len(monthly_rows) + 8
-        all_updates.append((f'D{stock_offset}', 'Stock Allocation'))
-        all_updates.append((f'D{stock_offset+1}', [['Stock', 'Amount']]))
-        
-        stock_rows = []
-        for stock, amount in stock_holdings.items():
-            if amount < 0:  # Only show current holdings (negative values)
-                stock_rows.append([stock, abs(amount)])
-        
-        if stock_rows:
-            all_updates.append((f'D{stock_offset+2}', stock_rows))
-        
-        # Fund performance data
         fund_offset = stock_offset + len(stock_rows) + 4
-        all_updates.append((f'D{fund_offset}', 'Fund Performance'))
-        all_updates.append((f'D{fund_offset+1}', [['Fund', 'Value']]))
+        div_offset = fund_offset + len(fund_rows) + 4
+        
+        # Assemble all updates up front so they can be sent with as few API calls as possible
+        all_updates = [
+            ('A1', 'Investment Dashboard'),
+            ('A3', 'Portfolio Summary'),
+            ('A4:B9', summary_rows),
+            ('A11', 'Fund Allocation'),
+            *([(f'A12:B{11 + len(fund_allocation_rows)}', fund_allocation_rows)] if fund_allocation_rows else []),
+            (f'A{row_offset}', 'Stock Holdings'),
+            *([(f'A{row_offset+1}:B{row_offset + len(stock_holding_rows)}', stock_holding_rows)] if stock_holding_rows else []),
+            ('D3', 'Chart Data'),
+            ('D4', 'Monthly Activity by Category'),
+            ('D5', [monthly_headers]),
+            *([('D6', monthly_rows)] if monthly_rows else []),
+            (f'D{stock_offset}', 'Stock Allocation'),
+            (f'D{stock_offset+1}', [['Stock', 'Amount']]),
+            *([(f'D{stock_offset+2}', stock_rows)] if stock_rows else []),
+            (f'D{fund_offset}', 'Fund Performance'),
+            (f'D{fund_offset+1}', [['Fund', 'Value']]),
+            *([(f'D{fund_offset+2}', fund_rows)] if fund_rows else []),
+            *([(f'D{div_offset}', 'Dividend Income by Stock'),
+               (f'D{div_offset+1}', [['Stock', 'Dividend']])] if has_dividends else []),
+            *([(f'D{div_offset+2}:E{div_offset + 1 + len(div_rows)}', div_rows)] if div_rows else [])
+        ]
         
-        fund_rows = []
-        for fund, amount in fund_allocation.items():
-            fund_rows.append([fund, amount])
-            
-        if fund_rows:
-            all_updates.append((f'D{fund_offset+2}', fund_rows))
-            
-        # Dividend income by stock
-        if 'Dividend' in df['Category'].values:
-            dividend_data = df[df['Category'] == 'Dividend']
-            dividend_by_stock = dividend_data.groupby('Stock')['Amount'].sum().sort_values(ascending=False)
-            
-            div_offset = fund_offset + len(fund_rows) + 4
-            all_updates.append((f'D{div_offset}', 'Dividend Income by Stock'))
-            all_updates.append((f'D{div_offset+1}', [['Stock', 'Dividend']]))
-            
-            div_rows = []
-            for stock, amount in dividend_by_stock.items():
-                if pd.notna(stock):
-                    div_rows.append([stock, amount])
-                    
-            if div_rows:
-                all_updates.append((f'D{div_offset+2}', div_rows))
+        currency_format = {'numberFormat': {'type': 'CURRENCY', 'pattern': '"$"#,##0.00'}}
+        all_formats = [
+            ('A1', {'textFormat': {'bold': True, 'fontSize': 14}}),
+            ('A3', {'textFormat': {'bold': True}}),
+            ('A11', {'textFormat': {'bold': True}}),
+            (f'A{row_offset}', {'textFormat': {'bold': True}}),
+            ('D3', {'textFormat': {'bold': True}}),
+            ('B4:B9', currency_format),
+            *([(f'B12:B{11 + len(fund_allocation_rows)}', currency_format)] if fund_allocation_rows else []),
+            *([(f'B{row_offset+1}:B{row_offset + len(stock_holding_rows)}', currency_format)] if stock_holding_rows else [])
+        ]
+        
+        # Clear existing dashboard - this is one API call
+        self.dashboard_worksheet.clear()
         
         # Execute all updates in efficient batches
         if batch_updates:
-            # Process in batches of 10 updates
-            batch_size = 10
-            update_batches = [all_updates[i:i+batch_size] for i in range(0, len(all_updates), batch_size)]
-            
-            print(f"Updating dashboard in {len(update_batches)} batches...")
-            
-            for i, batch in enumerate(update_batches):
-                print(f"Processing batch {i+1}/{len(update_batches)}...")
-                # Create a batch update
-                batch_data = {}
-                for cell, value in batch:
-                    batch_data[cell] = value
-                
-                # Execute batch update
-                self.dashboard_worksheet.batch_update(batch_data)
-                
-                # Sleep between batches to avoid rate limits
-                if i < len(update_batches) - 1 and delay_seconds > 0:  # Don't sleep after the last batch
-                    time.sleep(delay_seconds)
-            
-            # Apply formats in a single batch if possible
-            format_data = {}
-            for cell, format_value in all_formats:
-                format_data[cell] = format_value
+            # Send every value range in a single values.batchUpdate call
+            value_data = [
+                {'range': cell, 'values': value if isinstance(value, list) else [[value]]}
+                for cell, value in all_updates
+            ]
             
-            if format_data:
-                for cell, format_value in all_formats:
-                    try:
-                        self.dashboard_worksheet.format(cell, format_value)
-                        time.sleep(0.1)  # Small delay between format operations
-                    except Exception as e:
-                        print(f"Warning: Could not format cell {cell}: {str(e)}")
+            print(f"Updating dashboard with {len(value_data)} ranges in a single request...")
+            call_with_backoff(self.dashboard_worksheet.batch_update, value_data, value_input_option='USER_ENTERED')
         else:
             # Execute updates individually (slower but more reliable)
             for cell, value in all_updates:
                 try:
-                    self.dashboard_worksheet.update(cell, value)
-                    time.sleep(0.1)  # Small delay to avoid rate limits
+                    call_with_backoff(self.dashboard_worksheet.update, cell, value, value_input_option='USER_ENTERED')
                 except Exception as e:
                     print(f"Warning: Could not update cell {cell}: {str(e)}")
-            
-            # Apply formats
-            for cell, format_value in all_formats:
-                try:
-                    self.dashboard_worksheet.format(cell, format_value)
-                    time.sleep(0.1)  # Small delay between format operations
-                except Exception as e:
-                    print(f"Warning: Could not format cell {cell}: {str(e)}")
         
+        # Apply all formats in a single spreadsheets.batchUpdate call
+        self.apply_dashboard_formats(all_formats)
+        
+        self._last_dashboard_hash = transactions_hash
         print("Investment dashboard updated successfully")
+    
+    def apply_dashboard_formats(self, formats):
+        """Apply (A1 range, format) pairs to the dashboard in a single spreadsheets.batchUpdate call"""
+        format_requests = [
+            {
+                'repeatCell': {
+                    'range': a1_range_to_grid_range(cell, self.dashboard_worksheet.id),
+                    'cell': {'userEnteredFormat': format_value},
+                    'fields': 'userEnteredFormat(%s)' % ','.join(format_value.keys())
+                }
+            }
+            for cell, format_value in formats
+        ]
+        
+        if not format_requests:
+            return
+        
+        try:
+            self.sheet.batch_update({'requests': format_requests})
+        except Exception as e:
+            print(f"Warning: Could not format dashboard cells: {str(e)}")
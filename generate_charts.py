@@ -1,17 +1,20 @@
 import argparse
-import gspread
 import pandas as pd
 import matplotlib.pyplot as plt
-from google.oauth2.service_account import Credentials
+from csv_financial_tracker import get_gspread_client
 import os
 
+def slice_values(rows, start_row, end_row, start_col, end_col):
+    """Slice a rectangular block out of get_all_values() output, dropping trailing empty rows"""
+    block = [row[start_col:end_col] for row in rows[start_row:end_row]]
+    while block and not any(block[-1]):
+        block.pop()
+    return block
+
 def generate_charts(sheet_id, creds_path='google_credentials.json', output_dir='charts'):
     """Generate charts from Google Sheet data and save them as image files"""
     # Setup credentials
-    scope = ['https://spreadsheets.google.com/feeds',
-             'https://www.googleapis.com/auth/drive']
-    creds = Credentials.from_service_account_file(creds_path, scopes=scope)
-    client = gspread.authorize(creds)
+    client = get_gspread_client(creds_path)
     
     # Open sheet
     try:
@@ -29,26 +32,28 @@ def generate_charts(sheet_id, creds_path='google_credentials.json', output_dir='
         dashboard = sheet.worksheet('Dashboard')
         print("Accessing dashboard data for charts")
         
-        # Get category data
-        category_data = dashboard.get_values('D5:E100')  # Adjust range as needed
+        # Fetch the whole dashboard once and slice the ranges we need in memory
+        all_rows = dashboard.get_all_values()
+        
+        # Get category data (equivalent to D5:E100)
+        category_data = slice_values(all_rows, 4, 100, 3, 5)
         if not category_data:
             print("No category data found")
             return False
             
         # Find where the monthly data starts
-        monthly_header_cell = None
-        for i, row in enumerate(dashboard.get_all_values()):
+        monthly_start_row = None
+        for i, row in enumerate(all_rows):
             if 'Monthly Data' in str(row):
-                monthly_header_cell = f'D{i+2}'  # +2 because we need the header row and arrays are 0-indexed
+                monthly_start_row = i + 1  # The header row follows the section title
                 break
                 
-        if not monthly_header_cell:
+        if monthly_start_row is None:
             print("Could not find monthly data section")
             return False
             
-        # Get monthly data
-        monthly_range = f"{monthly_header_cell}:G100"  # Adjust as needed
-        monthly_data = dashboard.get_values(monthly_range)
+        # Get monthly data (equivalent to D{header}:G100)
+        monthly_data = slice_values(all_rows, monthly_start_row, 100, 3, 7)
         
         # Process category data for pie chart
         category_df = pd.DataFrame(category_data[1:], columns=category_data[0])  # Skip header in first row
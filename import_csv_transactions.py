@@ -1,12 +1,90 @@
 import os
 import argparse
-from csv_financial_tracker import FinancialTracker
 import csv
+import json
 import time
-from datetime import datetime
+from csv_financial_tracker import FinancialTracker, call_with_backoff, read_csv_transactions
+
+# Shortest initial backoff delay, so even --delay 0 waits before retrying a rate-limited write
+MIN_BACKOFF_DELAY = 1.0
+
+# Largest JSON payload sent in a single append_rows request before splitting into several
+MAX_PAYLOAD_BYTES = 2 * 1024 * 1024
+
+# Directory holding the transaction IDs already imported into each sheet
+IDS_CACHE_DIR = os.path.expanduser('~/.investment_cache')
+
+def split_rows_by_payload_size(rows, max_bytes=MAX_PAYLOAD_BYTES):
+    """Group rows into as few chunks as possible, keeping each chunk's JSON payload under max_bytes"""
+    chunk, chunk_bytes = [], 0
+    for row in rows:
+        row_bytes = len(json.dumps(row)) + 1
+        if chunk and chunk_bytes + row_bytes > max_bytes:
+            yield chunk
+            chunk, chunk_bytes = [], 0
+        chunk.append(row)
+        chunk_bytes += row_bytes
+    if chunk:
+        yield chunk
+
+def read_csv_transaction_ids(csv_file_path):
+    """Read only the TransactionID column of the CSV, or None if some rows have no ID"""
+    with open(csv_file_path, newline='', encoding='utf-8-sig') as file:
+        reader = csv.reader(file)
+        header = next(reader, [])
+        if 'TransactionID' not in header:
+            return None
+        id_index = header.index('TransactionID')
+        
+        ids = set()
+        for row in reader:
+            if not row:
+                continue  # Skip blank lines
+            transaction_id = row[id_index] if id_index < len(row) else ''
+            if not transaction_id:
+                return None  # Rows without an ID always get a new fallback ID
+            ids.add(transaction_id)
+    return ids
+
+def ids_cache_path(sheet_id):
+    """Path of the cached transaction IDs for a sheet"""
+    return os.path.join(IDS_CACHE_DIR, f"{sheet_id}.ids")
+
+def load_cached_ids(sheet_id):
+    """Load the transaction IDs recorded after the last import into this sheet"""
+    try:
+        with open(ids_cache_path(sheet_id)) as f:
+            return set(f.read().splitlines())
+    except OSError:
+        return set()
+
+def save_cached_ids(sheet_id, ids):
+    """Record the transaction IDs known to be in this sheet"""
+    try:
+        os.makedirs(IDS_CACHE_DIR, exist_ok=True)
+        with open(ids_cache_path(sheet_id), 'w') as f:
+            f.write('\n'.join(sorted(ids)))
+    except OSError as e:
+        print(f"Could not update transaction ID cache: {str(e)}")
+
+def build_transaction_rows(chunks, tracker, date_format='%Y-%m-%d'):
+    """Yield Google Sheets rows for each DataFrame chunk of transactions using vectorized parsing"""
+    # One timestamp for the whole import; batch and row indexes keep fallback IDs unique
+    ts = int(time.time())
+    for i, chunk in enumerate(chunks):
+        if chunk.empty:
+            continue
+        print(f"Processing batch {i+1} with {len(chunk)} transactions...")
+        yield from tracker.format_transaction_rows(chunk, date_format, i, ts)
+
+def append_transaction_rows(worksheet, rows, delay):
+    """Append rows to the worksheet, backing off only when the API is rate limited"""
+    call_with_backoff(worksheet.append_rows, rows, value_input_option='USER_ENTERED',
+                      base_delay=max(delay, MIN_BACKOFF_DELAY))
+    return len(rows)
 
 def import_with_batching(csv_file_path, sheet_name=None, sheet_id=None, creds='google_credentials.json', 
-                         date_format='%Y-%m-%d', batch_size=10, delay=1.0):
+                         date_format='%Y-%m-%d', batch_size=1000, delay=1.0, use_cache=True):
     """
     Import transactions from CSV with batched processing to avoid API rate limits
     
@@ -17,7 +95,9 @@ def import_with_batching(csv_file_path, sheet_name=None, sheet_id=None, creds='g
     - creds: Path to Google API credentials
     - date_format: Format of dates in the CSV
     - batch_size: Number of transactions to process in each batch
-    - delay: Delay in seconds between API write batches
+    - delay: Initial backoff delay in seconds when a write is rate limited (at least 1 second)
+    - use_cache: Skip the import without contacting Google when every CSV transaction ID
+      is in the local ID cache (only used with sheet_id; disable if rows were deleted from the sheet)
     """
     if not os.path.isfile(csv_file_path):
         print(f"Error: CSV file '{csv_file_path}' not found")
@@ -27,33 +107,51 @@ def import_with_batching(csv_file_path, sheet_name=None, sheet_id=None, creds='g
         print(f"Error: Google credentials file '{creds}' not found")
         return False
     
+    # Skip all network calls when every transaction in the CSV was already imported
+    csv_ids = read_csv_transaction_ids(csv_file_path) if use_cache else None
+    if csv_ids is not None and sheet_id and csv_ids <= load_cached_ids(sheet_id):
+        print("No new transactions to import (all transaction IDs already imported)")
+        return True
+    
     # Initialize the tracker
     tracker = FinancialTracker(google_creds_path=creds)
     
     # Create or open the spreadsheet
     tracker.create_financial_spreadsheet(sheet_name=sheet_name, sheet_id=sheet_id)
     
-    # Read all transactions from CSV
-    transactions = []
-    with open(csv_file_path, 'r') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            transactions.append(row)
-    
-    print(f"Read {len(transactions)} transactions from CSV")
-    
     # Get existing transaction IDs to avoid duplicates
     try:
-        existing_transaction_ids = tracker.transactions_worksheet.col_values(6)[1:]  # Skip header
+        existing_ids = set(tracker.get_transaction_ids())
+        ids_loaded = True
     except Exception as e:
         print(f"Error reading existing transaction IDs: {str(e)}")
-        existing_transaction_ids = []
+        existing_ids = set()
+        ids_loaded = False
+    
+    # Stream new transactions from the CSV instead of loading the whole file into memory
+    new_transactions = (chunk[~chunk['TransactionID'].isin(existing_ids)]
+                        for chunk in read_csv_transactions(csv_file_path, batch_size))
+    rows = build_transaction_rows(new_transactions, tracker, date_format)
+    
+    # Send rows in a single request, splitting only if the payload is too large for one call.
+    # Split requests are sent one after another so each append lands after the previous one.
+    total_new = 0
+    total_imported = 0
+    for request_number, rows_to_add in enumerate(split_rows_by_payload_size(rows), start=1):
+        total_new += len(rows_to_add)
+        try:
+            total_imported += append_transaction_rows(tracker.transactions_worksheet, rows_to_add, delay)
+            print(f"Added {len(rows_to_add)} transactions (total: {total_imported})")
+        except Exception as e:
+            print(f"Error in write request {request_number}: {str(e)}")
+            print("Continuing with next request...")
     
-    # Filter out transactions that already exist
-    new_transactions = [t for t in transactions if t.get('TransactionID', '') not in existing_transaction_ids]
-    print(f"Found {len(new_transactions)} new transactions to import")
+    # Remember which IDs are now in the sheet, counting the CSV's only if every write succeeded
+    if use_cache and ids_loaded:
+        known_ids = existing_ids | csv_ids if csv_ids is not None and total_imported == total_new else existing_ids
+        save_cached_ids(tracker.sheet.id, known_ids)
     
-    if not new_transactions:
+    if total_new == 0:
         print("No new transactions to import")
         # Print the sheet URL and ID for reference
         try:
@@ -65,84 +163,6 @@ def import_with_batching(csv_file_path, sheet_name=None, sheet_id=None, creds='g
             pass
         return True
     
-    # Process transactions in batches
-    batches = [new_transactions[i:i+batch_size] for i in range(0, len(new_transactions), batch_size)]
-    print(f"Split imports into {len(batches)} batches of up to {batch_size} transactions each")
-    
-    total_imported = 0
-    for i, batch in enumerate(batches):
-        print(f"Processing batch {i+1}/{len(batches)} with {len(batch)} transactions...")
-        
-        # Prepare rows for batch upload
-        rows_to_add = []
-        for transaction in batch:
-            # Parse date
-            try:
-                date_str = transaction.get('Date', '')
-                date_obj = datetime.strptime(date_str, date_format)
-                formatted_date = date_obj.strftime("%Y-%m-%d")
-            except ValueError:
-                formatted_date = date_str
-            
-            # Get description and amount
-            description = transaction.get('Description', '')
-            try:
-                amount = float(transaction.get('Amount', 0))
-            except ValueError:
-                amount_str = transaction.get('Amount', '0').replace('$', '').replace(',', '')
-                amount = float(amount_str)
-            
-            # Get account and merchant
-            account = transaction.get('Account', 'Unknown')
-            merchant = transaction.get('Merchant', '')
-            
-            # Determine if transaction is pending
-            pending = transaction.get('Pending', 'No')
-            
-            # Categorize the transaction
-            category = tracker.categorize_transaction(description, merchant)
-            
-            # Transaction ID
-            transaction_id = transaction.get('TransactionID', f"csv_{i}_{int(datetime.now().timestamp())}")
-            
-            # Create row
-            row = [
-                formatted_date,
-                description,
-                amount,
-                category,
-                account,
-                transaction_id,
-                pending,
-                merchant
-            ]
-            
-            rows_to_add.append(row)
-        
-        # Batch update to Google Sheets
-        try:
-            # Use batch update approach
-            # First determine the next empty row
-            try:
-                existing_rows = len(tracker.transactions_worksheet.get_all_values())
-            except:
-                existing_rows = 1  # Just the header row
-            
-            # Add rows to sheet
-            if rows_to_add:
-                tracker.transactions_worksheet.append_rows(rows_to_add)
-                total_imported += len(rows_to_add)
-                print(f"Added {len(rows_to_add)} transactions (total: {total_imported})")
-            
-            # Sleep to avoid rate limits
-            if i < len(batches) - 1:  # Don't sleep after the last batch
-                print(f"Waiting {delay} seconds before next batch...")
-                time.sleep(delay)
-                
-        except Exception as e:
-            print(f"Error in batch {i+1}: {str(e)}")
-            print("Continuing with next batch...")
-    
     print(f"Successfully imported {total_imported} transactions")
     
     # Only update dashboard at the end, not for each batch
@@ -174,8 +194,9 @@ def main():
     parser.add_argument('--sheet_id', help='ID of the Google Sheet to use (from sheet URL)')
     parser.add_argument('--creds', default='google_credentials.json', help='Path to Google API credentials JSON file')
     parser.add_argument('--date_format', default='%Y-%m-%d', help='Format of dates in the CSV file (e.g., %%Y-%%m-%%d)')
-    parser.add_argument('--batch_size', type=int, default=10, help='Number of transactions to process in each batch')
-    parser.add_argument('--delay', type=float, default=1.0, help='Delay in seconds between API write batches')
+    parser.add_argument('--batch_size', type=int, default=1000, help='Number of transactions to process in each batch')
+    parser.add_argument('--delay', type=float, default=1.0, help='Initial backoff delay in seconds when a write is rate limited (at least 1 second)')
+    parser.add_argument('--no_cache', action='store_true', help='Always check the sheet instead of the local transaction ID cache')
     
     args = parser.parse_args()
     
@@ -186,7 +207,8 @@ def main():
         creds=args.creds,
         date_format=args.date_format,
         batch_size=args.batch_size,
-        delay=args.delay
+        delay=args.delay,
+        use_cache=not args.no_cache
     )
     
     if success:
@@ -1,14 +1,26 @@
 import os
 import argparse
-import gspread
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Charts are only saved to files, so skip interactive backend setup
 import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime
 import re
-from google.oauth2.service_account import Credentials
+from concurrent.futures import ProcessPoolExecutor
+from gspread.urls import DRIVE_FILES_API_V3_URL
+from csv_financial_tracker import get_gspread_client, _STOCK_RE
 import matplotlib.ticker as mtick
 
+# Simplify long line paths as much as possible when rendering
+plt.rcParams['path.simplify_threshold'] = 1.0
+
+# Resolution of the saved chart images
+CHART_DPI = 150
+
+# Figure reused by every chart drawn in this process
+_figure = None
+
 def format_currency(x, pos):
     """Format y-axis ticks as currency"""
     if abs(x) >= 1e6:
@@ -18,38 +30,325 @@ def format_currency(x, pos):
     else:
         return '${:,.0f}'.format(x)
 
-def extract_stock_symbol(description):
-    """Extract stock symbols from transaction descriptions"""
-    match = re.search(r'\(([A-Z\.]+)\)', description)
-    if match:
-        return match.group(1)
-    return None
+def format_currency_vec(values):
+    """Format an array of values as currency labels, choosing each scale with one vectorized pass"""
+    values = np.asarray(values, dtype=float)
+    magnitude = np.abs(values)
+    scale = np.where(magnitude >= 1e6, 1e6, np.where(magnitude >= 1e3, 1e3, 1.0))
+    suffix = np.where(magnitude >= 1e6, 'M', np.where(magnitude >= 1e3, 'K', ''))
+    return [
+        '${:,.1f}{}'.format(v, s) if s else '${:,.0f}'.format(v)
+        for v, s in zip((values / scale).tolist(), suffix.tolist())
+    ]
+
+# Keywords identifying each transaction type, matched against lowercased descriptions
+_INITIAL_RE = re.compile(r'initial fund capital')
+_BUY_RE = re.compile(r'purchase|accumulate|long position|acquisition|investment in')
+_SELL_RE = re.compile(r'sell|liquidate|close position|divestment|profit-taking')
+_DIVIDEND_RE = re.compile(r'dividend')
+_FEE_RE = re.compile(r'fee|expense|commission|research|audit')
+
+def identify_transaction_types(df):
+    """Identify transaction types from descriptions and amounts for every row at once"""
+    desc = df['Description'].str.lower()
+    amount = df['Amount']
+    
+    # Conditions are checked in order; the first one that matches wins
+    conditions = [
+        desc.str.contains(_INITIAL_RE),
+        (amount < 0) & desc.str.contains(_BUY_RE),
+        (amount > 0) & desc.str.contains(_SELL_RE),
+        desc.str.contains(_DIVIDEND_RE),
+        (amount < 0) & desc.str.contains(_FEE_RE)
+    ]
+    choices = ['Initial Capital', 'Buy', 'Sell', 'Dividend', 'Fee']
+    return np.select(conditions, choices, default='Other')
+
+def fetch_transactions(sheet):
+    """Fetch the Transactions worksheet as a DataFrame with numeric amounts and datetime dates"""
+    # Get transactions as typed values: numbers arrive as numbers and dates as serial numbers
+    data = sheet.values_get('Transactions', params={
+        'valueRenderOption': 'UNFORMATTED_VALUE',
+        'dateTimeRenderOption': 'SERIAL_NUMBER'
+    }).get('values', [])
+    
+    if len(data) <= 1:  # Only header or empty
+        return None
+    
+    # Convert to DataFrame, padding rows to the header width since the API omits trailing empty cells
+    headers = data[0]
+    n = len(headers)
+    df = pd.DataFrame([row[:n] + [''] * (n - len(row)) for row in data[1:]], columns=headers)
+    df['Description'] = df['Description'].fillna('').astype(str)
+    
+    # Convert data types
+    df['Amount'] = pd.to_numeric(df['Amount'].replace('', np.nan))  # Blank cells are missing amounts
+    # Only a handful of accounts repeat across every row, so store them as a categorical
+    df['Account'] = df['Account'].astype('category')
+    
+    # Dates the API returns as numbers are Sheets serials (days since 1899-12-30); dates stored
+    # as text, including digit-only strings like 20240105, are parsed as date strings
+    is_serial = df['Date'].map(lambda v: isinstance(v, (int, float)) and not isinstance(v, bool)).astype(bool)
+    text_dates = df['Date'].where(~is_serial & (df['Date'] != ''))  # Blank cells are missing dates
+    # Parse each distinct text date on its own so one format isn't inferred for all of them
+    parsed_text = {value: pd.to_datetime(value, errors='coerce') for value in text_dates.dropna().unique()}
+    dates = pd.to_datetime(text_dates.map(parsed_text), errors='coerce')
+    dates[is_serial] = pd.to_datetime(df['Date'][is_serial].astype(float), unit='D', origin='1899-12-30')
+    df['Date'] = dates
+    
+    return df
+
+def load_transactions(client, sheet, cache_dir):
+    """Load typed transactions, reusing a cached copy while the spreadsheet is unmodified"""
+    cache_path = os.path.join(cache_dir, '.cache.pkl')
+    meta_path = os.path.join(cache_dir, '.cache.meta')
+    
+    # The Drive modifiedTime changes whenever any cell in the spreadsheet is edited
+    try:
+        modified_time = client.request(
+            'get', f"{DRIVE_FILES_API_V3_URL}/{sheet.id}", params={'fields': 'modifiedTime'}
+        ).json()['modifiedTime']
+    except Exception as e:
+        print(f"Could not check sheet modification time, skipping cache: {str(e)}")
+        modified_time = None
+    
+    # Tie the cache to this spreadsheet so other sheets written to the same directory never match
+    cache_key = f"{sheet.id} {modified_time}"
+    
+    if modified_time and os.path.isfile(cache_path) and os.path.isfile(meta_path):
+        with open(meta_path) as f:
+            if f.read().strip() == cache_key:
+                print("Sheet unchanged since last run, using cached transactions")
+                return pd.read_pickle(cache_path)
+    
+    df = fetch_transactions(sheet)
+    
+    if df is not None and modified_time:
+        df.to_pickle(cache_path)
+        with open(meta_path, 'w') as f:
+            f.write(cache_key)
+    
+    return df
 
-def identify_transaction_type(row):
-    """Identify transaction types from descriptions and amounts"""
-    desc = row['Description'].lower()
-    amount = float(row['Amount'])
-    
-    if 'initial fund capital' in desc:
-        return 'Initial Capital'
-    elif amount < 0 and any(word in desc for word in ['purchase', 'accumulate', 'long position', 'acquisition', 'investment in']):
-        return 'Buy'
-    elif amount > 0 and any(word in desc for word in ['sell', 'liquidate', 'close position', 'divestment', 'profit-taking']):
-        return 'Sell'
-    elif 'dividend' in desc:
-        return 'Dividend'
-    elif amount < 0 and any(word in desc for word in ['fee', 'expense', 'commission', 'research', 'audit']):
-        return 'Fee'
+def new_figure(figsize):
+    """Return this process's reusable figure, cleared and resized for the next chart"""
+    global _figure
+    if _figure is None:
+        _figure = plt.figure(figsize=figsize)
     else:
-        return 'Other'
+        _figure.clear()
+        _figure.set_size_inches(figsize)
+        plt.figure(_figure.number)
+    return _figure
+
+def plot_portfolio_allocation(fund_allocation, stock_allocation, output_path):
+    """1. Portfolio Overview Pie Chart"""
+    fig = new_figure((12, 8))
+    plt.subplot(121)
+    fund_allocation.plot(kind='pie', autopct='%1.1f%%', startangle=90)
+    plt.title('Investment Allocation by Fund', fontsize=14)
+    plt.ylabel('')
+    
+    # Add stock allocation pie chart
+    plt.subplot(122)
+    # Only include top 10 stocks for readability
+    top_stocks = stock_allocation.nlargest(10)
+    if len(stock_allocation) > 10:
+        top_stocks['Other'] = stock_allocation[10:].sum()
+    
+    top_stocks.plot(kind='pie', autopct='%1.1f%%', startangle=90)
+    plt.title('Investment Allocation by Stock (Top 10)', fontsize=14)
+    plt.ylabel('')
+    
+    plt.tight_layout()
+    fig.savefig(output_path, dpi=CHART_DPI)
+
+def plot_stock_holdings(stock_holdings, output_path):
+    """2. Stock Holdings Bar Chart"""
+    # Only include stocks still held (negative overall balance)
+    current_holdings = stock_holdings[stock_holdings < 0].sort_values()
+    
+    if current_holdings.empty:
+        return
+    
+    # Sort once and reuse the same top 15 for the bars and their labels
+    top_holdings = current_holdings.abs().sort_values(ascending=True).tail(15)
+    
+    fig = new_figure((12, 10))
+    ax = top_holdings.plot(kind='barh')
+    
+    # Format y-axis with currency
+    ax.xaxis.set_major_formatter(mtick.FuncFormatter(format_currency))
+    
+    # Add value labels to bars
+    labels = format_currency_vec(top_holdings.values)
+    for i, (v, label) in enumerate(zip(top_holdings.values, labels)):
+        ax.text(v + (v * 0.01), i, label, va='center')
+    
+    plt.title('Current Stock Holdings (Top 15 by Value)', fontsize=14)
+    plt.xlabel('Investment Amount')
+    plt.grid(axis='x', linestyle='--', alpha=0.7)
+    plt.tight_layout()
+    fig.savefig(output_path, dpi=CHART_DPI)
+
+def plot_monthly_activity(monthly_activity, output_path):
+    """3. Monthly Transaction Activity"""
+    fig = new_figure((14, 8))
+    
+    # Adjust sign for better visualization
+    monthly_activity = monthly_activity.copy()
+    if 'Buy' in monthly_activity.columns:
+        monthly_activity['Buy'] = monthly_activity['Buy'].abs() * -1  # Make buys negative
+    if 'Fee' in monthly_activity.columns:
+        monthly_activity['Fee'] = monthly_activity['Fee'].abs() * -1  # Make fees negative
+    monthly_activity.index = monthly_activity.index.astype(str)  # Label months as YYYY-MM
+        
+    # Plot stacked bar chart
+    ax = monthly_activity.plot(
+        kind='bar', 
+        stacked=True,
+        ax=fig.gca()
+    )
+    
+    # Format y-axis with currency
+    ax.yaxis.set_major_formatter(mtick.FuncFormatter(format_currency))
+    
+    plt.title('Monthly Transaction Activity', fontsize=14)
+    plt.xlabel('Month')
+    plt.ylabel('Amount')
+    plt.legend(title='Transaction Type')
+    plt.grid(axis='y', linestyle='--', alpha=0.3)
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    fig.savefig(output_path, dpi=CHART_DPI)
+
+def plot_portfolio_growth(monthly_balance, output_path):
+    """4. Cumulative Portfolio Growth"""
+    cumulative_balance = monthly_balance.cumsum()
+    cumulative_balance.index = cumulative_balance.index.astype(str)  # Label months as YYYY-MM
+    
+    fig = new_figure((14, 8))
+    ax = cumulative_balance.plot()
+    
+    # Add markers for key points
+    ax.plot(cumulative_balance.index, cumulative_balance.values, 'o', 
+            markersize=6, color='red', alpha=0.6)
+    
+    # Format y-axis with currency
+    ax.yaxis.set_major_formatter(mtick.FuncFormatter(format_currency))
+    
+    # Add grid and styling
+    plt.grid(linestyle='--', alpha=0.7)
+    plt.title('Cumulative Portfolio Value Over Time', fontsize=14)
+    plt.xlabel('Month')
+    plt.ylabel('Portfolio Value')
+    plt.xticks(rotation=45)
+    
+    # Fill area under curve
+    ax.fill_between(cumulative_balance.index, 0, cumulative_balance.values, 
+                   alpha=0.3, color='green')
+    
+    plt.tight_layout()
+    fig.savefig(output_path, dpi=CHART_DPI)
 
-def create_investment_visualizations(sheet_id, output_dir='investment_charts', creds_path='google_credentials.json'):
-    """Create investment visualizations from Google Sheet data"""
-    # Setup credentials
-    scope = ['https://spreadsheets.google.com/feeds',
-             'https://www.googleapis.com/auth/drive']
-    creds = Credentials.from_service_account_file(creds_path, scopes=scope)
-    client = gspread.authorize(creds)
+def plot_fund_performance(fund_performance, output_path):
+    """5. Fund Performance Comparison"""
+    fig = new_figure((12, 8))
+    ax = fund_performance.plot(kind='bar')
+    
+    # Format y-axis with currency
+    ax.yaxis.set_major_formatter(mtick.FuncFormatter(format_currency))
+    
+    # Add value labels
+    labels = format_currency_vec(fund_performance.values)
+    for i, (v, label) in enumerate(zip(fund_performance, labels)):
+        label_color = 'black' if v > 0 else 'white'
+        ax.text(i, v + (0.01 * v if v > 0 else -0.05 * v), 
+               label, ha='center', va='bottom' if v > 0 else 'top',
+               color=label_color)
+    
+    plt.title('Fund Performance Comparison', fontsize=14)
+    plt.xlabel('Fund')
+    plt.ylabel('Net Value')
+    plt.grid(axis='y', linestyle='--', alpha=0.3)
+    plt.tight_layout()
+    fig.savefig(output_path, dpi=CHART_DPI)
+
+def plot_dividend_income(dividend_by_month, output_path):
+    """6. Dividend Income Tracking"""
+    dividend_by_month = dividend_by_month.copy()
+    dividend_by_month.index = dividend_by_month.index.astype(str)  # Label months as YYYY-MM
+    
+    fig = new_figure((14, 8))
+    ax = dividend_by_month.plot(kind='bar', color='green', alpha=0.7)
+    
+    # Add line for cumulative dividends
+    ax2 = ax.twinx()
+    cumulative_dividends = dividend_by_month.cumsum()
+    cumulative_dividends.plot(ax=ax2, marker='o', color='darkgreen', linewidth=2)
+    
+    # Add value labels for bars
+    labels = format_currency_vec(dividend_by_month.values)
+    for i, (v, label) in enumerate(zip(dividend_by_month, labels)):
+        ax.text(i, v + (v * 0.02), label, ha='center')
+    
+    # Format axes with currency
+    ax.yaxis.set_major_formatter(mtick.FuncFormatter(format_currency))
+    ax2.yaxis.set_major_formatter(mtick.FuncFormatter(format_currency))
+    
+    # Labels and styling
+    ax.set_title('Dividend Income by Month', fontsize=14)
+    ax.set_xlabel('Month')
+    ax.set_ylabel('Monthly Dividend')
+    ax2.set_ylabel('Cumulative Dividends')
+    ax.grid(axis='y', linestyle='--', alpha=0.3)
+    
+    # Add legend
+    from matplotlib.lines import Line2D
+    legend_elements = [
+        Line2D([0], [0], color='green', lw=0, marker='s', markersize=10, alpha=0.7, label='Monthly Dividends'),
+        Line2D([0], [0], color='darkgreen', lw=2, marker='o', markersize=6, label='Cumulative Dividends')
+    ]
+    ax.legend(handles=legend_elements, loc='upper left')
+    
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    fig.savefig(output_path, dpi=CHART_DPI)
+
+def plot_dividend_sources(dividend_by_stock, output_path):
+    """Pie chart of dividend sources"""
+    fig = new_figure((12, 8))
+    top_dividend_stocks = dividend_by_stock.head(8)
+    if len(dividend_by_stock) > 8:
+        top_dividend_stocks['Other'] = dividend_by_stock[8:].sum()
+        
+    top_dividend_stocks.plot(kind='pie', autopct='%1.1f%%', startangle=90)
+    plt.title('Dividend Income by Stock', fontsize=14)
+    plt.ylabel('')
+    plt.tight_layout()
+    fig.savefig(output_path, dpi=CHART_DPI)
+
+def plot_transaction_counts(transaction_counts, output_path):
+    """7. Transaction Count by Type"""
+    fig = new_figure((10, 8))
+    ax = transaction_counts.plot(kind='bar')
+    
+    # Add value labels
+    for i, v in enumerate(transaction_counts):
+        ax.text(i, v + 0.5, str(v), ha='center')
+    
+    plt.title('Number of Transactions by Type', fontsize=14)
+    plt.xlabel('Transaction Type')
+    plt.ylabel('Count')
+    plt.grid(axis='y', linestyle='--', alpha=0.3)
+    plt.tight_layout()
+    fig.savefig(output_path, dpi=CHART_DPI)
+
+def create_investment_visualizations(sheet_id, output_dir='investment_charts', creds_path='google_credentials.json',
+                                     tracker=None):
+    """Create investment visualizations from Google Sheet data, reusing an existing tracker's client if given"""
+    # Reuse an already authorized client instead of signing in again
+    client = tracker.gc if tracker is not None else get_gspread_client(creds_path)
     
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
@@ -59,246 +358,68 @@ def create_investment_visualizations(sheet_id, output_dir='investment_charts', c
         sheet = client.open_by_key(sheet_id)
         print(f"Successfully opened sheet: {sheet.title}")
         
-        # Get transactions worksheet
-        transactions_ws = sheet.worksheet("Transactions")
-        data = transactions_ws.get_all_values()
-        
-        if len(data) <= 1:  # Only header or empty
+        # Load transactions, reusing the local cache when the sheet hasn't changed
+        df = load_transactions(client, sheet, output_dir)
+        if df is None:
             print("No transaction data found in the sheet")
             return False
         
-        # Convert to DataFrame
-        headers = data[0]
-        df = pd.DataFrame(data[1:], columns=headers)
-        
-        # Convert data types
-        df['Amount'] = pd.to_numeric(df['Amount'])
-        df['Date'] = pd.to_datetime(df['Date'])
-        df['Month'] = df['Date'].dt.strftime('%Y-%m')
+        # Derived columns are computed on every run so code changes never read stale values
+        df['Month'] = df['Date'].dt.to_period('M')
         
         # Extract stock symbols and transaction types
-        df['Stock'] = df['Description'].apply(extract_stock_symbol)
-        df['TransactionType'] = df.apply(identify_transaction_type, axis=1)
+        df['Stock'] = df['Description'].str.extract(_STOCK_RE, expand=False)
+        df['TransactionType'] = pd.Categorical(identify_transaction_types(df))
         
         print(f"Loaded {len(df)} transactions")
         print(f"Generating visualizations in {output_dir}...")
         
-        # 1. Portfolio Overview Pie Chart
-        plt.figure(figsize=(12, 8))
-        plt.subplot(121)
-        # Get buy transactions for true allocation (negative values)
+        # Aggregates shared by several charts, each computed once
+        by_stock = df.groupby('Stock')['Amount'].sum()
+        by_account = df.groupby('Account', observed=True)['Amount'].sum()
+        # Buy transactions give the true allocation (negative values)
         buy_data = df[df['TransactionType'] == 'Buy']
-        fund_allocation = buy_data.groupby('Account')['Amount'].sum().abs()
-        fund_allocation.plot(kind='pie', autopct='%1.1f%%', startangle=90)
-        plt.title('Investment Allocation by Fund', fontsize=14)
-        plt.ylabel('')
-        
-        # Add stock allocation pie chart
-        plt.subplot(122)
-        stock_allocation = buy_data.groupby('Stock')['Amount'].sum().abs()
-        # Only include top 10 stocks for readability
-        top_stocks = stock_allocation.nlargest(10)
-        if len(stock_allocation) > 10:
-            top_stocks['Other'] = stock_allocation[10:].sum()
-        
-        top_stocks.plot(kind='pie', autopct='%1.1f%%', startangle=90)
-        plt.title('Investment Allocation by Stock (Top 10)', fontsize=14)
-        plt.ylabel('')
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, '1_portfolio_allocation.png'), dpi=300)
-        plt.close()
-        
-        # 2. Stock Holdings Bar Chart
-        stock_holdings = df.groupby('Stock')['Amount'].sum()
-        # Only include stocks still held (negative overall balance)
-        current_holdings = stock_holdings[stock_holdings < 0].sort_values()
-        
-        if not current_holdings.empty:
-            plt.figure(figsize=(12, 10))
-            ax = current_holdings.abs().sort_values(ascending=True).tail(15).plot(kind='barh')
-            
-            # Format y-axis with currency
-            ax.xaxis.set_major_formatter(mtick.FuncFormatter(format_currency))
-            
-            # Add value labels to bars
-            for i, v in enumerate(current_holdings.abs().sort_values(ascending=True).tail(15)):
-                ax.text(v + (v * 0.01), i, format_currency(v, 0), va='center')
-            
-            plt.title('Current Stock Holdings (Top 15 by Value)', fontsize=14)
-            plt.xlabel('Investment Amount')
-            plt.grid(axis='x', linestyle='--', alpha=0.7)
-            plt.tight_layout()
-            plt.savefig(os.path.join(output_dir, '2_stock_holdings.png'), dpi=300)
-            plt.close()
-            
-        # 3. Monthly Transaction Activity
-        plt.figure(figsize=(14, 8))
-        
-        # Group by month and transaction type
-        monthly_activity = df.pivot_table(
+        buy_by_account = buy_data.groupby('Account', observed=True)['Amount'].sum().abs()
+        buy_by_stock = buy_data.groupby('Stock')['Amount'].sum().abs()
+        by_month_type = df.pivot_table(
             index='Month', 
             columns='TransactionType',
             values='Amount',
-            aggfunc='sum'
+            aggfunc='sum',
+            observed=True
         ).fillna(0)
         
-        # Adjust sign for better visualization
-        if 'Buy' in monthly_activity.columns:
-            monthly_activity['Buy'] = monthly_activity['Buy'].abs() * -1  # Make buys negative
-        if 'Fee' in monthly_activity.columns:
-            monthly_activity['Fee'] = monthly_activity['Fee'].abs() * -1  # Make fees negative
-            
-        # Plot stacked bar chart
-        ax = monthly_activity.plot(
-            kind='bar', 
-            stacked=True,
-            figsize=(14, 8)
-        )
-        
-        # Format y-axis with currency
-        ax.yaxis.set_major_formatter(mtick.FuncFormatter(format_currency))
-        
-        plt.title('Monthly Transaction Activity', fontsize=14)
-        plt.xlabel('Month')
-        plt.ylabel('Amount')
-        plt.legend(title='Transaction Type')
-        plt.grid(axis='y', linestyle='--', alpha=0.3)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, '3_monthly_activity.png'), dpi=300)
-        plt.close()
-        
-        # 4. Cumulative Portfolio Growth
-        # Calculate cumulative sum of all transactions by date
-        df_sorted = df.sort_values('Date')
-        df_sorted['Cumulative'] = df_sorted['Amount'].cumsum()
-        
-        # Group by month for smoother chart
-        monthly_balance = df_sorted.groupby('Month')['Amount'].sum()
-        cumulative_balance = monthly_balance.cumsum()
-        
-        plt.figure(figsize=(14, 8))
-        ax = cumulative_balance.plot()
-        
-        # Add markers for key points
-        ax.plot(cumulative_balance.index, cumulative_balance.values, 'o', 
-                markersize=6, color='red', alpha=0.6)
-        
-        # Format y-axis with currency
-        ax.yaxis.set_major_formatter(mtick.FuncFormatter(format_currency))
-        
-        # Add grid and styling
-        plt.grid(linestyle='--', alpha=0.7)
-        plt.title('Cumulative Portfolio Value Over Time', fontsize=14)
-        plt.xlabel('Month')
-        plt.ylabel('Portfolio Value')
-        plt.xticks(rotation=45)
-        
-        # Fill area under curve
-        ax.fill_between(cumulative_balance.index, 0, cumulative_balance.values, 
-                       alpha=0.3, color='green')
+        # Group by month for the cumulative growth chart (monthly periods sort chronologically)
+        monthly_balance = df.groupby('Month')['Amount'].sum().sort_index()
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, '4_portfolio_growth.png'), dpi=300)
-        plt.close()
+        # Each chart only receives the small pre-aggregated data it plots
+        chart_tasks = [
+            (plot_portfolio_allocation, buy_by_account, buy_by_stock, '1_portfolio_allocation.png'),
+            (plot_stock_holdings, by_stock, '2_stock_holdings.png'),
+            (plot_monthly_activity, by_month_type, '3_monthly_activity.png'),
+            (plot_portfolio_growth, monthly_balance, '4_portfolio_growth.png'),
+            (plot_fund_performance, by_account.sort_values(), '5_fund_performance.png'),
+            (plot_transaction_counts, df['TransactionType'].value_counts(), '8_transaction_counts.png')
+        ]
         
-        # 5. Fund Performance Comparison
-        fund_performance = df.groupby('Account')['Amount'].sum().sort_values()
-        
-        plt.figure(figsize=(12, 8))
-        ax = fund_performance.plot(kind='bar')
-        
-        # Format y-axis with currency
-        ax.yaxis.set_major_formatter(mtick.FuncFormatter(format_currency))
-        
-        # Add value labels
-        for i, v in enumerate(fund_performance):
-            label_color = 'black' if v > 0 else 'white'
-            ax.text(i, v + (0.01 * v if v > 0 else -0.05 * v), 
-                   format_currency(v, 0), ha='center', va='bottom' if v > 0 else 'top',
-                   color=label_color)
-        
-        plt.title('Fund Performance Comparison', fontsize=14)
-        plt.xlabel('Fund')
-        plt.ylabel('Net Value')
-        plt.grid(axis='y', linestyle='--', alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, '5_fund_performance.png'), dpi=300)
-        plt.close()
-        
-        # 6. Dividend Income Tracking
         if 'Dividend' in df['TransactionType'].values:
             dividend_data = df[df['TransactionType'] == 'Dividend']
             dividend_by_month = dividend_data.groupby('Month')['Amount'].sum()
-            
-            plt.figure(figsize=(14, 8))
-            ax = dividend_by_month.plot(kind='bar', color='green', alpha=0.7)
-            
-            # Add line for cumulative dividends
-            ax2 = ax.twinx()
-            cumulative_dividends = dividend_by_month.cumsum()
-            cumulative_dividends.plot(ax=ax2, marker='o', color='darkgreen', linewidth=2)
-            
-            # Add value labels for bars
-            for i, v in enumerate(dividend_by_month):
-                ax.text(i, v + (v * 0.02), format_currency(v, 0), ha='center')
-            
-            # Format axes with currency
-            ax.yaxis.set_major_formatter(mtick.FuncFormatter(format_currency))
-            ax2.yaxis.set_major_formatter(mtick.FuncFormatter(format_currency))
-            
-            # Labels and styling
-            ax.set_title('Dividend Income by Month', fontsize=14)
-            ax.set_xlabel('Month')
-            ax.set_ylabel('Monthly Dividend')
-            ax2.set_ylabel('Cumulative Dividends')
-            ax.grid(axis='y', linestyle='--', alpha=0.3)
-            
-            # Add legend
-            from matplotlib.lines import Line2D
-            legend_elements = [
-                Line2D([0], [0], color='green', lw=0, marker='s', markersize=10, alpha=0.7, label='Monthly Dividends'),
-                Line2D([0], [0], color='darkgreen', lw=2, marker='o', markersize=6, label='Cumulative Dividends')
-            ]
-            ax.legend(handles=legend_elements, loc='upper left')
-            
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            plt.savefig(os.path.join(output_dir, '6_dividend_income.png'), dpi=300)
-            plt.close()
-            
-            # Also create pie chart of dividend sources
-            plt.figure(figsize=(12, 8))
             dividend_by_stock = dividend_data.groupby('Stock')['Amount'].sum().sort_values(ascending=False)
-            top_dividend_stocks = dividend_by_stock.head(8)
-            if len(dividend_by_stock) > 8:
-                top_dividend_stocks['Other'] = dividend_by_stock[8:].sum()
-                
-            top_dividend_stocks.plot(kind='pie', autopct='%1.1f%%', startangle=90)
-            plt.title('Dividend Income by Stock', fontsize=14)
-            plt.ylabel('')
-            plt.tight_layout()
-            plt.savefig(os.path.join(output_dir, '7_dividend_sources.png'), dpi=300)
-            plt.close()
-        
-        # 7. Transaction Count by Type
-        transaction_counts = df['TransactionType'].value_counts()
-        
-        plt.figure(figsize=(10, 8))
-        ax = transaction_counts.plot(kind='bar')
-        
-        # Add value labels
-        for i, v in enumerate(transaction_counts):
-            ax.text(i, v + 0.5, str(v), ha='center')
+            chart_tasks += [
+                (plot_dividend_income, dividend_by_month, '6_dividend_income.png'),
+                (plot_dividend_sources, dividend_by_stock, '7_dividend_sources.png')
+            ]
         
-        plt.title('Number of Transactions by Type', fontsize=14)
-        plt.xlabel('Transaction Type')
-        plt.ylabel('Count')
-        plt.grid(axis='y', linestyle='--', alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, '8_transaction_counts.png'), dpi=300)
-        plt.close()
+        # The charts are independent, so render them in parallel across CPU cores
+        max_workers = min(len(chart_tasks), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(plot, *data, os.path.join(output_dir, filename))
+                for plot, *data, filename in chart_tasks
+            ]
+            for future in futures:
+                future.result()
         
         print(f"Successfully created 8 visualization charts in {output_dir}/")
         return True